@@ -0,0 +1,22 @@
+"""Build script for wordlehelper.
+
+whwe.py needs NumPy; Numba is optional and speeds up scoring when installed.
+The Cython kernel in wordle_kernel.pyx is also optional: whwe.py falls back to
+Numba or NumPy when it is missing. Cython is declared as a build requirement in
+pyproject.toml, so ``pip install .`` builds the kernel; for a checkout,
+``python setup.py build_ext --inplace`` builds it next to whwe.py.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='wordlehelper',
+    py_modules=['whwe', 'wordlehelper'],
+    install_requires=['numpy'],
+    extras_require={'numba': ['numba']},
+    ext_modules=cythonize(
+        'wordle_kernel.pyx',
+        language_level=3,
+        compiler_directives={'boundscheck': False, 'wraparound': False},
+    ),
+)
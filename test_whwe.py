@@ -0,0 +1,43 @@
+import numpy as np
+
+import whwe
+
+# Repeated letters on both sides exercise the green/yellow/gray bookkeeping
+WORDS = ['crane', 'never', 'eerie', 'there', 'speed', 'erase', 'abbey', 'geese',
+         'llama', 'mamma', 'craze', 'crave', 'which', 'fuzzy', 'sassy', 'tares']
+
+def pattern_id(feedback: str) -> int:
+    return sum('_YG'.index(f) * 3 ** i for i, f in enumerate(feedback))
+
+def build_tables(words):
+    W = whwe.encode_words(words)
+    return W, whwe.word_columns(W), whwe.count_letters(W), whwe.letter_bitmasks(W)
+
+def test_pattern_matrix_matches_get_feedback_pattern():
+    W = whwe.encode_words(WORDS)
+    patterns = whwe.build_pattern_matrix(W)
+    for g, guess in enumerate(WORDS):
+        for t, target in enumerate(WORDS):
+            expected = pattern_id(whwe.get_feedback_pattern(guess, target))
+            assert patterns[g, t] == expected, (guess, target)
+            assert whwe.feedback_id(W[g], W[t]) == expected, (guess, target)
+
+def test_filter_keeps_exactly_consistent_words():
+    W, columns, letter_counts, letter_bits = build_tables(WORDS)
+    for guess in WORDS:
+        for target in WORDS:
+            feedback = whwe.get_feedback_pattern(guess, target)
+            mask = np.ones(len(WORDS), dtype=np.bool_)
+            whwe.filter_candidates(mask, guess, feedback, columns, letter_counts, letter_bits)
+            kept = [word for word, keep in zip(WORDS, mask) if keep]
+            assert kept == [word for word in WORDS if whwe.get_feedback_pattern(guess, word) == feedback], (guess, target)
+
+def test_filter_repeated_letter_gray_and_yellow():
+    # NEVER against CRANE marks the first E yellow and the second gray;
+    # CRANE has exactly one E and must survive
+    W, columns, letter_counts, letter_bits = build_tables(WORDS)
+    feedback = whwe.get_feedback_pattern('never', 'crane')
+    assert feedback == 'YY__Y'
+    mask = np.ones(len(WORDS), dtype=np.bool_)
+    whwe.filter_candidates(mask, 'never', feedback, columns, letter_counts, letter_bits)
+    assert [word for word, keep in zip(WORDS, mask) if keep] == ['crane']
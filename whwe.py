@@ -1,23 +1,48 @@
 from collections import Counter
+import hashlib
+import multiprocessing
+import os
 import random
-import math
 import sys
-from typing import List
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange, set_num_threads
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional; the kernels below then run as plain Python
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    from wordle_kernel import score_all  # Cython build of the scoring kernel, see setup.py
+except ImportError:
+    score_all = None
 
 MAX_TURNS = 6
 MAX_CANDIDATES_FOR_ENTROPY = 50
+NUM_PATTERNS = 3 ** 5  # every feedback pattern fits in one byte
+PATTERN_WEIGHTS = 3 ** np.arange(5)  # pattern id = sum(code_i * 3**i), code: _=0, Y=1, G=2
+# Bump the version tag whenever the pattern encoding or opener scoring changes
+PATTERN_CACHE_TEMPLATE = '.patterns_v1_{}.npy'
+OPENER_CACHE_TEMPLATE = '.opener_v2_{}.txt'
+PATTERN_BLOCK_ROWS = 256
+LETTER_CODES = bytes(c - ord('a') if ord('a') <= c <= ord('z') else 255 for c in range(256))  # bytes.translate table
+MAX_PATTERN_TABLE_WORDS = 16000  # the table takes N**2 bytes; past this, score on the fly
+LOG2 = np.log2(np.arange(1, MAX_PATTERN_TABLE_WORDS + 1, dtype=np.float64))  # LOG2[c - 1] == log2(c)
 
 def load_words(path: str) -> List[str]:
     with open(path, 'r') as file:
         words = [line.strip().lower() for line in file if len(line.strip()) == 5]
-    return words
-
-def letter_freq(words: List[str]) -> Counter:
-    freq = Counter()
-    for word in words:
-        unique_letters = set(word)
-        freq.update(unique_letters)
-    return freq
+    # Only plain a-z words can be encoded into the letter-code arrays
+    return [word for word in words if word.isascii() and word.isalpha()]
 
 def get_feedback_pattern(guess: str, target: str) -> str:
     """Generate feedback pattern for a guess against a target word"""
@@ -38,12 +63,158 @@ def get_feedback_pattern(guess: str, target: str) -> str:
 
     return ''.join(feedback)
 
-def calculate_entropy(guess: str, candidates: List[str]) -> float:
-    if not candidates:
+def encode_words(words: List[str]) -> np.ndarray:
+    """Encode words as an (N, 5) uint8 array of letter codes 0-25"""
+    return np.frombuffer(''.join(words).encode().translate(LETTER_CODES), dtype=np.uint8).reshape(-1, 5)
+
+def words_digest(words: List[str]) -> str:
+    return hashlib.md5('\n'.join(words).encode()).hexdigest()
+
+def word_columns(W: np.ndarray) -> List[np.ndarray]:
+    """Split W into five contiguous per-position letter columns"""
+    return [np.ascontiguousarray(W[:, i]) for i in range(5)]
+
+def count_letters(W: np.ndarray) -> np.ndarray:
+    """Per-word letter counts, an (N, 26) uint8 array"""
+    letter_counts = np.zeros((len(W), 26), dtype=np.uint8)
+    np.add.at(letter_counts, (np.arange(len(W))[:, None], W), 1)
+    return letter_counts
+
+def letter_bitmasks(W: np.ndarray) -> np.ndarray:
+    """Per-word uint32 bitmask of the letters present, bit c set for letter code c"""
+    return np.bitwise_or.reduce(np.uint32(1) << W.astype(np.uint32), axis=1)
+
+def build_pattern_matrix(W: np.ndarray) -> np.ndarray:
+    """Build the (N, N) table of feedback pattern ids, patterns[guess, target]"""
+    n = len(W)
+    letter_counts = count_letters(W)
+    # same_letter[g, j, i]: guess letters j and i are equal; earlier_same also requires j < i
+    same_letter = (W[:, :, None] == W[:, None, :]).astype(np.uint8)
+    earlier_same = same_letter * np.triu(np.ones((5, 5), dtype=np.uint8), 1)
+    patterns = np.empty((n, n), dtype=np.uint8)
+    for start in range(0, n, PATTERN_BLOCK_ROWS):
+        stop = min(start + PATTERN_BLOCK_ROWS, n)
+        guesses = W[start:stop]
+        green = (guesses[:, None, :] == W[None, :, :]).astype(np.uint8)
+        # Copies of each guess letter in the target left over after greens are matched
+        available = letter_counts[:, guesses].transpose(1, 0, 2).astype(np.int16)
+        available -= green @ same_letter[start:stop]
+        # Non-green copies of the same letter earlier in the guess claim those first
+        claimed = (1 - green) @ earlier_same[start:stop]
+        yellow = (green == 0) & (claimed < available)
+        codes = 2 * green + yellow
+        patterns[start:stop] = codes @ PATTERN_WEIGHTS
+    return patterns
+
+def write_cache_file(path: str, data: bytes = b'', array: Optional[np.ndarray] = None):
+    """Write a cache file under a temporary name and move it into place, so an
+    interrupted run never leaves a truncated cache behind"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.cache_', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            if array is not None:
+                np.save(file, array)
+            else:
+                file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_pattern_matrix(words: List[str], W: np.ndarray) -> Optional[np.ndarray]:
+    """Load the pattern table cached for this word list, building it on first use"""
+    if len(words) > MAX_PATTERN_TABLE_WORDS:
+        return None
+    path = PATTERN_CACHE_TEMPLATE.format(words_digest(words))
+    if os.path.exists(path):
+        try:
+            patterns = np.load(path, mmap_mode='r')
+            if patterns.shape == (len(words), len(words)) and patterns.dtype == np.uint8:
+                return patterns
+        except (OSError, ValueError):
+            pass
+        print("Cached feedback pattern table is unreadable, rebuilding...")
+    else:
+        print("Building feedback pattern table (first run only)...")
+    patterns = build_pattern_matrix(W)
+    write_cache_file(path, array=patterns)
+    return patterns
+
+@njit(cache=True)
+def entropy_from_counts(counts: np.ndarray) -> float:
+    """Shannon entropy in bits of a pattern histogram such as np.bincount output"""
+    nonzero = counts[counts > 0]
+    total = nonzero.sum()
+    if total == 0:
+        return 0.0
+    # -sum(p * log2(p)) == sum(c * (log2(T) - log2(c))) / T, with the logs of integer counts looked up
+    if total <= len(LOG2):
+        logs = LOG2[nonzero - 1]
+        log_total = LOG2[total - 1]
+    else:
+        logs = np.log2(nonzero.astype(np.float64))
+        log_total = np.log2(total)
+    return (nonzero * (log_total - logs)).sum() / total
+
+@njit(cache=True)
+def feedback_id(guess: np.ndarray, target: np.ndarray) -> int:
+    """Pattern id of an encoded guess against an encoded target"""
+    target_bits = 0
+    used = 0  # bit j set once target position j is matched
+    for i in range(5):
+        target_bits |= 1 << int(target[i])
+        if guess[i] == target[i]:
+            used |= 1 << i
+    pattern = 0
+    weight = 1
+    for i in range(5):
+        code = 0
+        if guess[i] == target[i]:
+            code = 2
+        elif (target_bits >> int(guess[i])) & 1:
+            for j in range(5):
+                if not (used >> j) & 1 and target[j] == guess[i]:
+                    used |= 1 << j
+                    code = 1
+                    break
+        pattern += code * weight
+        weight *= 3
+    return pattern
+
+@njit(cache=True)
+def entropy_row(guess_idx: int, cand_idx: np.ndarray, W: np.ndarray) -> float:
+    counts = np.zeros(NUM_PATTERNS, dtype=np.int64)
+    for target_idx in cand_idx:
+        counts[feedback_id(W[guess_idx], W[target_idx])] += 1
+    return entropy_from_counts(counts)
+
+@njit(cache=True)
+def table_entropy(pattern_row: np.ndarray, cand_idx: np.ndarray) -> float:
+    counts = np.zeros(NUM_PATTERNS, dtype=np.int64)
+    for target_idx in cand_idx:
+        counts[pattern_row[target_idx]] += 1
+    return entropy_from_counts(counts)
+
+@njit(cache=True, parallel=True)
+def score_guesses(guess_idx: np.ndarray, cand_idx: np.ndarray, W: np.ndarray, patterns: Optional[np.ndarray], is_cand: np.ndarray) -> np.ndarray:
+    """Entropy of every guess in guess_idx, plus a small bonus for possible answers"""
+    scores = np.empty(len(guess_idx), dtype=np.float64)
+    for i in prange(len(guess_idx)):
+        if patterns is None:
+            scores[i] = entropy_row(guess_idx[i], cand_idx, W)
+        else:
+            scores[i] = table_entropy(patterns[guess_idx[i]], cand_idx)
+        if is_cand[guess_idx[i]]:
+            scores[i] += 0.01
+    return scores
+
+def calculate_entropy(guess_idx: int, cand_idx: np.ndarray, W: np.ndarray, patterns: Optional[np.ndarray]) -> float:
+    if len(cand_idx) == 0:
         return 0.0
-    pattern_counts = Counter(get_feedback_pattern(guess, target) for target in candidates)
-    total = len(candidates)
-    return -sum((count / total) * math.log2(count / total) for count in pattern_counts.values())
+    if patterns is None:
+        return entropy_row(guess_idx, cand_idx, W)
+    counts = np.bincount(patterns[guess_idx, cand_idx], minlength=NUM_PATTERNS)
+    return float(entropy_from_counts(counts))
 
 def enforce_hard_mode_filter(word: str, guess: str, feedback: str) -> bool:
     for i, (g, f) in enumerate(zip(guess, feedback)):
@@ -53,67 +224,144 @@ def enforce_hard_mode_filter(word: str, guess: str, feedback: str) -> bool:
             return False
     return True
 
-def pick_guess_entropy(candidates: List[str], all_words: List[str] = None, max_candidates: int = MAX_CANDIDATES_FOR_ENTROPY, hard_mode: bool = False, last_guess: str = '', last_feedback: str = '') -> str:
+def pick_guess_entropy(candidates: np.ndarray, all_words: List[str], W: np.ndarray, patterns: Optional[np.ndarray], max_candidates: int = MAX_CANDIDATES_FOR_ENTROPY, hard_mode: bool = False, last_guess: str = '', last_feedback: str = '') -> str:
     if len(candidates) == 1:
-        return candidates[0]
-    guess_pool = all_words if all_words else candidates
+        return all_words[candidates[0]]
+    pool_idx = np.arange(len(all_words))
     if hard_mode and last_guess and last_feedback:
-        guess_pool = [word for word in guess_pool if enforce_hard_mode_filter(word, last_guess, last_feedback)]
-    sample_cands = random.sample(candidates, max_candidates) if len(candidates) > max_candidates else candidates
-    best_guess = None
-    best_entropy = -1.0
-    for guess in guess_pool:
-        entropy = calculate_entropy(guess, sample_cands)
-        if guess in candidates:
-            entropy += 0.01
-        if entropy > best_entropy:
-            best_entropy = entropy
-            best_guess = guess
-    return best_guess if best_guess else random.choice(candidates)
-
-def pick_guess(candidates: List[str], all_words: List[str] = None, use_entropy: bool = True, hard_mode: bool = False, last_guess: str = '', last_feedback: str = '') -> str:
+        pool_idx = np.array([i for i, word in enumerate(all_words) if enforce_hard_mode_filter(word, last_guess, last_feedback)], dtype=np.intp)
+    if len(pool_idx) == 0:
+        return all_words[random.choice(candidates)]
+    # With the pattern table a full candidate slice is cheap; sample only when scoring on the fly.
+    # max_candidates is a per-turn soft cap; load_opener overrides it since its answer is cached
+    cand_idx = candidates
+    if patterns is None and len(candidates) > max_candidates:
+        cand_idx = np.array(random.sample(list(candidates), max_candidates), dtype=np.intp)
+    is_cand = np.zeros(len(all_words), dtype=np.bool_)
+    is_cand[candidates] = True
+    if HAVE_NUMBA:
+        scores = score_guesses(pool_idx, cand_idx, W, patterns, is_cand)
+    elif score_all is not None:
+        scores = score_all(W, patterns, pool_idx, cand_idx) + 0.01 * is_cand[pool_idx]
+    else:
+        # Interpreted per-element kernels are slow; use the vectorized per-guess path instead
+        scores = np.array([calculate_entropy(g, cand_idx, W, patterns) for g in pool_idx]) + 0.01 * is_cand[pool_idx]
+    return all_words[pool_idx[int(np.argmax(scores))]]
+
+def load_opener(all_words: List[str], W: np.ndarray, patterns: Optional[np.ndarray]) -> str:
+    """Best first guess for this word list, computed once and cached on disk"""
+    path = OPENER_CACHE_TEMPLATE.format(words_digest(all_words))
+    if os.path.exists(path):
+        with open(path, 'r') as file:
+            opener = file.read().strip()
+        if opener in all_words:
+            return opener
+    # Turn one has no feedback (hard mode included), so one opener serves every game.
+    # It is cached for good, so always score it against every word, never a sample
+    opener = pick_guess_entropy(np.arange(len(all_words)), all_words, W, patterns, max_candidates=len(all_words))
+    write_cache_file(path, opener.encode())
+    return opener
+
+def pick_guess(candidates: np.ndarray, all_words: List[str], W: np.ndarray, patterns: Optional[np.ndarray], letter_counts: np.ndarray, use_entropy: bool = True, hard_mode: bool = False, last_guess: str = '', last_feedback: str = '') -> str:
     if use_entropy:
-        return pick_guess_entropy(candidates, all_words, hard_mode=hard_mode, last_guess=last_guess, last_feedback=last_feedback)
-    freqs = letter_freq(candidates)
-    top5_letters = set(letter for letter, _ in freqs.most_common(5))
-    filtered = [word for word in candidates if top5_letters.issubset(set(word))]
-    return random.choice(filtered if filtered else candidates)
-
-def filter_candidates(candidates: List[str], guess: str, feedback: str) -> List[str]:
-    filtered = []
-    for word in candidates:
-        if all(
-            (f == 'G' and word[i] == g) or
-            (f == 'Y' and word[i] != g and g in word) or
-            (f == '_' and ((g not in word) if feedback.count(g) == 0 else word.count(g) == feedback.count(g)))
-            for i, (g, f) in enumerate(zip(guess, feedback))
-        ):
-            filtered.append(word)
-    return filtered
-
-def show_top_candidates(candidates: List[str], top_n: int = 3):
-    scores = [(word, letter_freq([word])) for word in candidates]
-    top_words = sorted(candidates, key=lambda w: -calculate_entropy(w, candidates))[:top_n]
-    print(f"Top {top_n} ranked candidates by entropy: {', '.join(top_words)}")
-
-def simulate_game(target: str, all_words: List[str], use_entropy: bool = True, hard_mode: bool = False):
-    print(f"\nSimulating game for target: {target}\n")
-    candidates = all_words.copy()
+        return pick_guess_entropy(candidates, all_words, W, patterns, hard_mode=hard_mode, last_guess=last_guess, last_feedback=last_feedback)
+    # Letter presence comes from the precomputed counts rather than set(word) per turn
+    present = letter_counts[candidates] > 0
+    freqs = present.sum(axis=0)
+    # Like Counter.most_common(5), only letters some candidate actually contains; ties go alphabetically
+    top5_letters = np.argsort(-freqs, kind='stable')[:5]
+    top5_letters = top5_letters[freqs[top5_letters] > 0]
+    filtered = candidates[present[:, top5_letters].all(axis=1)]
+    return all_words[random.choice(filtered if len(filtered) else candidates)]
+
+def filter_candidates(mask: np.ndarray, guess: str, feedback: str, columns: List[np.ndarray], letter_counts: np.ndarray, letter_bits: np.ndarray) -> None:
+    """Narrow a boolean candidate mask over the rows of W, in place, to words consistent with feedback"""
+    codes = [ord(g) - ord('a') for g in guess]
+    # Copies of each letter the feedback proves are in the word, counted once per call
+    required = Counter(g for g, f in zip(codes, feedback) if f != '_')
+    for i, (g, f) in enumerate(zip(codes, feedback)):
+        if f == 'G':
+            mask &= columns[i] == g
+            continue
+        mask &= columns[i] != g
+        if required[g] == 0:
+            mask &= (letter_bits >> g) & 1 == 0
+        elif f == 'Y' and required[g] == 1:
+            mask &= (letter_bits >> g) & 1 == 1
+        elif f == 'Y':
+            mask &= letter_counts[:, g] >= required[g]
+        else:
+            mask &= letter_counts[:, g] == required[g]
+
+def show_top_candidates(candidates: np.ndarray, all_words: List[str], W: np.ndarray, patterns: Optional[np.ndarray], top_n: int = 3):
+    entropies = np.array([calculate_entropy(i, candidates, W, patterns) for i in candidates])
+    # Only the top_n need ordering; partition them out before sorting
+    top = np.arange(len(candidates))
+    if len(candidates) > top_n:
+        top = np.argpartition(-entropies, top_n - 1)[:top_n]
+    top = top[np.argsort(-entropies[top], kind='stable')]
+    print(f"Top {top_n} ranked candidates by entropy: {', '.join(all_words[candidates[i]] for i in top)}")
+
+def simulate_game(target: str, all_words: List[str], W: np.ndarray, columns: List[np.ndarray], patterns: Optional[np.ndarray], letter_counts: np.ndarray, letter_bits: np.ndarray, use_entropy: bool = True, hard_mode: bool = False, verbose: bool = True) -> Optional[int]:
+    """Play against a known target; returns the number of turns taken, or None if unsolved"""
+    if verbose:
+        print(f"\nSimulating game for target: {target}\n")
+    mask = np.ones(len(all_words), dtype=np.bool_)
+    candidates = np.flatnonzero(mask)
     last_guess = ''
     last_feedback = ''
+    opener = load_opener(all_words, W, patterns) if use_entropy else ''
     for turn in range(1, MAX_TURNS + 1):
-        guess = pick_guess(candidates, all_words, use_entropy, hard_mode, last_guess, last_feedback)
+        if turn == 1 and opener:
+            guess = opener
+        else:
+            guess = pick_guess(candidates, all_words, W, patterns, letter_counts, use_entropy, hard_mode, last_guess, last_feedback)
         feedback = get_feedback_pattern(guess, target)
-        print(f"Turn {turn}: Guess = {guess.upper()}, Feedback = {feedback}")
+        if verbose:
+            print(f"Turn {turn}: Guess = {guess.upper()}, Feedback = {feedback}")
         if feedback == "GGGGG":
-            print(f"Solved in {turn} turns!")
-            return
-        candidates = filter_candidates(candidates, guess, feedback)
+            if verbose:
+                print(f"Solved in {turn} turns!")
+            return turn
+        filter_candidates(mask, guess, feedback, columns, letter_counts, letter_bits)
+        candidates = np.flatnonzero(mask)
         last_guess, last_feedback = guess, feedback
-        if 1 < len(candidates) <= 10:
-            print(f"Remaining: {', '.join(candidates[:10])}")
-            show_top_candidates(candidates)
-    print("Failed to solve within 6 turns.")
+        if verbose and 1 < len(candidates) <= 10:
+            print(f"Remaining: {', '.join(all_words[i] for i in candidates[:10])}")
+            show_top_candidates(candidates, all_words, W, patterns)
+    if verbose:
+        print("Failed to solve within 6 turns.")
+    return None
+
+_worker_tables = ()
+
+def _init_simulation_worker(wordlist_path: str):
+    """Pool initializer: rebuild the word tables in the worker instead of pickling them"""
+    global _worker_tables
+    if HAVE_NUMBA:
+        set_num_threads(1)  # the pool already spreads games over every core
+    all_words = load_words(wordlist_path)
+    W = encode_words(all_words)
+    _worker_tables = (all_words, W, word_columns(W), load_pattern_matrix(all_words, W), count_letters(W), letter_bitmasks(W))
+
+def _simulate_target(target: str) -> Tuple[str, Optional[int]]:
+    return target, simulate_game(target, *_worker_tables, verbose=False)
+
+def simulate_all(wordlist_path: str, all_words: List[str], W: np.ndarray, patterns: Optional[np.ndarray]):
+    """Simulate a game for every word in the list across a process pool"""
+    # Make sure the opener cache exists so workers read it rather than each computing it
+    load_opener(all_words, W, patterns)
+    print(f"\nSimulating {len(all_words)} games...")
+    # Spawned workers avoid forking a process whose Numba thread pool may already be running
+    with multiprocessing.get_context('spawn').Pool(initializer=_init_simulation_worker, initargs=(wordlist_path,)) as pool:
+        results = pool.map(_simulate_target, all_words, chunksize=64)
+    turns = Counter(turn for _, turn in results)
+    for turn in range(1, MAX_TURNS + 1):
+        print(f"{turn} turns: {turns[turn]}")
+    print(f"Failed: {turns[None]}")
+    solved = len(results) - turns[None]
+    if solved:
+        print(f"Average turns when solved: {sum(t * n for t, n in turns.items() if t) / solved:.3f}")
 
 def main():
     print("Wordle Helper Command Line (with Entropy + Simulation + Hard Mode)")
@@ -124,13 +372,24 @@ def main():
     except FileNotFoundError:
         print(f"Error: Could not find wordlist file '{wordlist_path}'")
         return
+    # Row k of every array below (and of the pattern table) describes all_words[k];
+    # the word strings themselves are only needed for display
+    W = encode_words(all_words)
+    columns = word_columns(W)
+    letter_counts = count_letters(W)
+    letter_bits = letter_bitmasks(W)
+    patterns = load_pattern_matrix(all_words, W)
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--simulate-all':
+        simulate_all(wordlist_path, all_words, W, patterns)
+        return
 
     if len(sys.argv) > 1 and sys.argv[1] == '--simulate':
         if len(sys.argv) < 3:
             print("Usage: python whwe.py --simulate TARGETWORD")
             return
         target = sys.argv[2].lower()
-        simulate_game(target, all_words)
+        simulate_game(target, all_words, W, columns, patterns, letter_counts, letter_bits)
         return
 
     use_entropy_input = input("Use entropy-based guessing? (y/n, default=y): ").strip().lower()
@@ -142,16 +401,21 @@ def main():
     if hard_mode:
         print("Hard mode is ON")
 
-    candidates = all_words.copy()
+    mask = np.ones(len(all_words), dtype=np.bool_)
+    candidates = np.flatnonzero(mask)
     last_guess = ''
     last_feedback = ''
+    opener = load_opener(all_words, W, patterns) if use_entropy else ''
 
     for turn in range(1, MAX_TURNS + 1):
-        if not candidates:
+        if len(candidates) == 0:
             print("No valid candidates remain. There might be an error in the feedback.")
             break
 
-        guess = pick_guess(candidates, all_words, use_entropy, hard_mode, last_guess, last_feedback)
+        if not last_guess and opener:
+            guess = opener
+        else:
+            guess = pick_guess(candidates, all_words, W, patterns, letter_counts, use_entropy, hard_mode, last_guess, last_feedback)
         print(f"\nTurn {turn}: Try guess → {guess.upper()}")
 
         feedback = input("Enter feedback (G=green, Y=yellow, _=gray): ").strip().upper()
@@ -163,15 +427,16 @@ def main():
             print("Solved in", turn, "turns!")
             break
 
-        candidates = filter_candidates(candidates, guess, feedback)
+        filter_candidates(mask, guess, feedback, columns, letter_counts, letter_bits)
+        candidates = np.flatnonzero(mask)
         last_guess, last_feedback = guess, feedback
 
         print(f"{len(candidates)} possible words remain.")
         if 1 < len(candidates) <= 10:
-            print(f"Remaining candidates: {', '.join(candidates[:10])}")
-            show_top_candidates(candidates)
+            print(f"Remaining candidates: {', '.join(all_words[i] for i in candidates[:10])}")
+            show_top_candidates(candidates, all_words, W, patterns)
     else:
         print("Out of turns. Try again!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
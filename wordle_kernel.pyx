@@ -0,0 +1,72 @@
+# cython: language_level=3
+"""Compiled feedback and entropy kernels for whwe.py, for installs without Numba.
+
+Build in place with: python setup.py build_ext --inplace
+"""
+from libc.math cimport log2
+from libc.string cimport memset
+
+import numpy as np
+
+cdef enum:
+    NUM_PATTERNS = 243
+
+
+cdef inline unsigned char fb(const unsigned char* g, const unsigned char* t) noexcept nogil:
+    """Pattern id of an encoded guess against an encoded target, same encoding as whwe.feedback_id"""
+    cdef unsigned int target_bits = 0
+    cdef unsigned int used = 0
+    cdef int i, j, code
+    cdef int pattern = 0
+    cdef int weight = 1
+    for i in range(5):
+        target_bits |= (<unsigned int>1) << t[i]
+        if g[i] == t[i]:
+            used |= (<unsigned int>1) << i
+    for i in range(5):
+        code = 0
+        if g[i] == t[i]:
+            code = 2
+        elif (target_bits >> g[i]) & 1:
+            for j in range(5):
+                if not (used >> j) & 1 and t[j] == g[i]:
+                    used |= (<unsigned int>1) << j
+                    code = 1
+                    break
+        pattern += code * weight
+        weight *= 3
+    return <unsigned char>pattern
+
+
+cdef double entropy_row(const unsigned char* pattern_row, const unsigned char[:, ::1] W, Py_ssize_t guess_idx,
+                        const Py_ssize_t[::1] cands, bint use_table) noexcept nogil:
+    cdef unsigned int counts[NUM_PATTERNS]
+    cdef Py_ssize_t k, n = cands.shape[0]
+    cdef double p
+    cdef double entropy = 0.0
+    memset(counts, 0, sizeof(counts))
+    for k in range(n):
+        if use_table:
+            counts[pattern_row[cands[k]]] += 1
+        else:
+            counts[fb(&W[guess_idx, 0], &W[cands[k], 0])] += 1
+    for k in range(NUM_PATTERNS):
+        if counts[k]:
+            p = counts[k] / <double>n
+            entropy -= p * log2(p)
+    return entropy
+
+
+def score_all(const unsigned char[:, ::1] W, const unsigned char[:, ::1] patterns,
+              const Py_ssize_t[::1] guesses, const Py_ssize_t[::1] cands):
+    """Entropy of each guess against cands; patterns may be None to compute feedback from W"""
+    cdef double[::1] scores = np.empty(guesses.shape[0], dtype=np.float64)
+    cdef bint use_table = patterns is not None
+    cdef const unsigned char* pattern_row = NULL
+    cdef Py_ssize_t i
+    with nogil:
+        for i in range(guesses.shape[0]):
+            if use_table:
+                pattern_row = &patterns[guesses[i], 0]
+            scores[i] = entropy_row(pattern_row, W, guesses[i], cands, use_table)
+    return np.asarray(scores)
@@ -4,81 +4,88 @@ import random
 def load_words(path):
     with open(path, 'r') as file:
         words = [line.strip().lower() for line in file if len(line.strip()) == 5]
-    return words
+    # Letter sets and counts never change, so build them once instead of every turn
+    word_sets = {word: frozenset(word) for word in words}
+    word_letter_count = {word: Counter(word) for word in words}
+    return words, word_sets, word_letter_count
 
-def letter_freq(words):
+def letter_freq(words, word_sets):
     freq = Counter()
     for word in words:
-        unique_letters = set(word)
-        freq.update(unique_letters)
+        freq.update(word_sets[word])
     return freq
 
-def pick_guess(cands):    
-    freqs = letter_freq(cands)
+def pick_guess(cands, word_sets):    
+    freqs = letter_freq(cands, word_sets)
     top5_letters = set([letter for letter, _ in freqs.most_common(5)])
 
     # Find candidate words that contain all 5 top letters
-    filtered = [word for word in cands if top5_letters.issubset(set(word))]
+    filtered = [word for word in cands if top5_letters <= word_sets[word]]
 
     if filtered:
         return random.choice(filtered)
     else:
         return random.choice(cands)
 
-def filter_candidates(cands, guess, feedback):
+def filter_candidates(cands, guess, feedback, word_sets, word_letter_count):
+    # Everything that depends only on the guess and feedback is worked out once up front
+    green_pos = [(i, g_char) for i, (g_char, f_char) in enumerate(zip(guess, feedback)) if f_char == 'G']
+    yellow_pos = [(i, g_char) for i, (g_char, f_char) in enumerate(zip(guess, feedback)) if f_char == 'Y']
+    gray_present = {g_char for g_char, f_char in zip(guess, feedback) if f_char == '_'}
+    # Copies of each letter the feedback marks green or yellow
+    required = {g_char: 0 for g_char in guess}
+    for g_char, f_char in zip(guess, feedback):
+        if f_char in {'G', 'Y'}:
+            required[g_char] += 1
+
     filtered = []
     for word in cands:
         is_valid = True
+        letters = word_sets[word]
 
         # Handle greens first
-        for i, (g_char, f_char) in enumerate(zip(guess, feedback)):
-            if f_char == 'G':
-                if word[i] != g_char:
-                    is_valid = False
-                    break
+        for i, g_char in green_pos:
+            if word[i] != g_char:
+                is_valid = False
+                break
         
         if not is_valid:
             continue
 
-        # Handle yellows and greys
-        for i, (g_char, f_char) in enumerate(zip(guess, feedback)):
-            if f_char == 'Y':
-                # Yellow: letter is in word but not at this position
-                if g_char not in word or word[i] == g_char:
+        # Yellow: letter is in word but not at this position
+        for i, g_char in yellow_pos:
+            if g_char not in letters or word[i] == g_char:
+                is_valid = False
+                break
+
+        if not is_valid:
+            continue
+
+        # Grey: check if this letter appears more times in word than indicated by feedback
+        for g_char in gray_present:
+            # If this letter got no green/yellow feedback, it shouldn't be in the word
+            # Unless it appears elsewhere with green/yellow feedback
+            if required[g_char] == 0:
+                if g_char in letters:
+                    is_valid = False
+                    break
+            else:
+                # If word has more of this letter than feedback indicates, it's invalid
+                if word_letter_count[word][g_char] != required[g_char]:
                     is_valid = False
                     break
-            elif f_char == '_':
-                # Grey: check if this letter appears more times in word than indicated by feedback
-                total_guess_count = guess.count(g_char)
-                total_feedback_count = sum(
-                    1 for j in range(5)
-                    if guess[j] == g_char and feedback[j] in {'G', 'Y'}
-                )
-                
-                # If this letter got no green/yellow feedback, it shouldn't be in the word
-                # Unless it appears elsewhere with green/yellow feedback
-                if total_feedback_count == 0:
-                    if g_char in word:
-                        is_valid = False
-                        break
-                else:
-                    # If word has more of this letter than feedback indicates, it's invalid
-                    if word.count(g_char) != total_feedback_count:
-                        is_valid = False
-                        break
         
         if is_valid:
             filtered.append(word)
 
     return filtered
 
-
 def main():
     print("Wordle Helper Command Line")
     wordlist_path = 'all_letters.txt'  # replace with your actual word list path
 
     try:
-        candidates = load_words(wordlist_path)
+        candidates, word_sets, word_letter_count = load_words(wordlist_path)
         print(f"Loaded {len(candidates)} words.")
     except FileNotFoundError:
         print(f"Error: Could not find wordlist file '{wordlist_path}'")
@@ -89,7 +96,7 @@ def main():
             print("No valid candidates remain. There might be an error in the feedback.")
             break
             
-        guess = pick_guess(candidates)
+        guess = pick_guess(candidates, word_sets)
         print(f"\nTurn {turn}: Try guess → {guess.upper()}")
 
         feedback = input("Enter feedback (G=green, Y=yellow, _=gray): ").strip().upper()
@@ -101,7 +108,7 @@ def main():
             print("Solved in", turn, "turns!")
             break
 
-        candidates = filter_candidates(candidates, guess, feedback)
+        candidates = filter_candidates(candidates, guess, feedback, word_sets, word_letter_count)
         print(f"{len(candidates)} possible words remain.")
     else:
         print("Out of turns. Try again!")